@@ -2,12 +2,12 @@ import os
 import re
 import sys
 import time
+import random
 import asyncio
 import argparse
 import platform
 import shutil
 import aiohttp
-import aiofiles
 
 from urllib.parse import urljoin
 from typing import List, Tuple
@@ -23,13 +23,16 @@ from rich.progress import (
 from rich.console import Console
 from rich import box
 
-# Optional M3U8 support
+# status lines are coloured with explicit markup, so skip rich's repr highlighter
+console = Console(highlight=False)
+
+# Optional uvloop event loop (not available on Windows)
 try:
-    import m3u8
+    import uvloop
+    if platform.system() != "Windows":
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
 except ImportError:
-    m3u8 = None
-
-console = Console()
+    pass
 
 if platform.system() == "Windows":
     asyncio.set_event_loop_policy(asyncio.WindowsProactorEventLoopPolicy())
@@ -41,12 +44,32 @@ DEFAULT_SOURCE_URL      = os.getenv("SOURCE_URL", "")
 DEFAULT_MAX_CONNECTIONS = 200
 DEFAULT_MP4_CONNECTIONS = 16
 DEFAULT_CONNECT_TIMEOUT = 20
+DNS_CACHE_TTL           = 3600
 DEFAULT_OUTPUT_DIR      = "downloads"
-SEGMENT_CHUNK_SIZE      = 8 * 1024 * 1024
-FILE_CHUNK_SIZE         = 1 * 1024 * 1024
+SEGMENT_CHUNK_SIZE      = 256 * 1024
+READ_BUFFER_SIZE        = 2 * 1024 * 1024
 RETRIES                 = 3
+RETRY_BACKOFF           = 0.5
+PROGRESS_BATCH_BYTES    = 4 * 1024 * 1024
+PROGRESS_BATCH_SECS     = 0.1
+CONCURRENCY_START       = 16
+CONCURRENCY_MIN         = 4
+CONCURRENCY_STEP        = 4
+CONCURRENCY_INTERVAL    = 2.0
+REORDER_WINDOW          = 32    # HLS segments in flight or buffered in memory at once
+WRITE_FLAGS             = os.O_WRONLY | getattr(os, "O_BINARY", 0)
+CREATE_FLAGS            = WRITE_FLAGS | os.O_CREAT | os.O_TRUNC
 # ——————————————————————————————————————————————————————————————————————————————
 
+# EXT-X-STREAM-INF attributes
+_RE_BW     = re.compile(r"BANDWIDTH=(\d+)")
+_RE_RES    = re.compile(r"RESOLUTION=(\d+x\d+)")
+_RE_FPS    = re.compile(r"FRAME-RATE=([\d.]+)")
+_RE_CODECS = re.compile(r'CODECS="([^"]+)"')
+
+# media playlist: the first non-tag line after each #EXTINF is the segment URI
+_RE_SEGMENT = re.compile(r"#EXTINF:[^\n]*\n(?:[ \t]*#[^\n]*\n)*[ \t]*([^\s#][^\r\n]*)")
+
 async def fetch_text(session: aiohttp.ClientSession, url: str) -> str:
     async with session.get(url, timeout=aiohttp.ClientTimeout(total=5)) as resp:
         resp.raise_for_status()
@@ -57,55 +80,267 @@ async def get_content_length(session: aiohttp.ClientSession, url: str) -> int:
         resp.raise_for_status()
         return int(resp.headers.get('content-length', 0))
 
-async def download_chunk(session: aiohttp.ClientSession, url: str, start: int, end: int, part_file: str, progress: Progress, task_id: int):
-    headers = {'Range': f"bytes={start}-{end}"}
+# directories already created this run, so repeat downloads skip the makedirs syscalls
+_MKDIR_CACHE = set()
+
+def ensure_dir(path: str):
+    if path not in _MKDIR_CACHE:
+        os.makedirs(path, exist_ok=True)
+        _MKDIR_CACHE.add(path)
+
+def create_sized(path: str, size: int):
+    fd = os.open(path, CREATE_FLAGS, 0o644)
+    try:
+        os.ftruncate(fd, size)
+        # reserve the extents up front to avoid fragmentation (Linux only, best effort)
+        if size > 0 and hasattr(os, "posix_fallocate"):
+            try:
+                os.posix_fallocate(fd, 0, size)
+            except OSError:
+                pass
+    finally:
+        os.close(fd)
+
+def write_all(fd: int, data: bytes):
+    view = memoryview(data)
+    while view:
+        view = view[os.write(fd, view):]
+
+class ProgressBatch:
+    """Coalesces progress advances so rich re-renders at most every few MB or 100 ms."""
+
+    def __init__(self, progress: Progress, task_id: int):
+        self.progress = progress
+        self.task_id  = task_id
+        self.pending  = 0
+        self.flushed  = 0
+        self.last     = time.monotonic()
+
+    def advance(self, n: int):
+        self.pending += n
+        now = time.monotonic()
+        if self.pending >= PROGRESS_BATCH_BYTES or now - self.last >= PROGRESS_BATCH_SECS:
+            self.flush(now)
+
+    def flush(self, now: float = None):
+        if self.pending:
+            self.progress.update(self.task_id, advance=self.pending)
+            self.flushed += self.pending
+            self.pending  = 0
+        self.last = now or time.monotonic()
+
+    def rollback(self):
+        # drop unflushed bytes and un-count the ones already shown
+        if self.flushed:
+            self.progress.update(self.task_id, advance=-self.flushed)
+        self.pending = self.flushed = 0
+
+def is_retryable(exc: Exception) -> bool:
+    # client errors won't fix themselves, except timeouts and rate limiting
+    if isinstance(exc, aiohttp.ClientResponseError):
+        return not (400 <= exc.status < 500) or exc.status in (408, 429)
+    return True
+
+def backoff_delay(attempt: int) -> float:
+    # exponential backoff with +/-10% jitter so retries don't arrive in lockstep
+    delay = RETRY_BACKOFF * (2 ** (attempt - 1))
+    return delay + random.uniform(-0.1 * delay, 0.1 * delay)
+
+async def download_chunk(session: aiohttp.ClientSession, url: str, start: int, end: int, out_file: str, progress: Progress, task_id: int) -> bool:
+    """Download bytes start..end of url into the same range of the preallocated out_file."""
+    headers  = {'Range': f"bytes={start}-{end}"}
+    expected = end - start + 1
+    loop     = asyncio.get_running_loop()
     for attempt in range(1, RETRIES+1):
+        batch = ProgressBatch(progress, task_id)
         try:
             async with session.get(url, headers=headers, timeout=aiohttp.ClientTimeout(total=None)) as resp:
                 resp.raise_for_status()
-                async with aiofiles.open(part_file, 'wb') as f:
+                # each range gets its own descriptor, and with it its own file position
+                fd    = os.open(out_file, WRITE_FLAGS)
+                write = None
+                try:
+                    os.lseek(fd, start, os.SEEK_SET)
+                    written = 0
                     async for chunk in resp.content.iter_chunked(SEGMENT_CHUNK_SIZE):
-                        await f.write(chunk)
-                        progress.update(task_id, advance=len(chunk))
-            return
+                        written += len(chunk)
+                        if written > expected:
+                            raise IOError("server ignored the Range header")
+                        write = loop.run_in_executor(None, write_all, fd, chunk)
+                        await asyncio.shield(write)
+                        batch.advance(len(chunk))
+                finally:
+                    # if we were cancelled mid-write, let the worker thread finish before closing its fd
+                    if write is not None and not write.done():
+                        await asyncio.wait([write])
+                    os.close(fd)
+            if written != expected:
+                raise IOError(f"short read ({written} of {expected} bytes)")
+            batch.flush()
+            return True
+        except Exception as e:
+            # un-count the bytes of the failed attempt so retries don't inflate progress
+            batch.rollback()
+            console.print(f"[yellow]Attempt {attempt} failed for bytes {start}-{end}: {e}[/]")
+            if not is_retryable(e):
+                break
+            if attempt < RETRIES:
+                await asyncio.sleep(backoff_delay(attempt))
+    console.print(f"[red]Giving up on bytes {start}-{end} after {attempt} attempts[/]")
+    return False
+
+async def fetch_segment(session: aiohttp.ClientSession, url: str, progress: Progress, task_id: int) -> bytearray:
+    for attempt in range(1, RETRIES+1):
+        data  = bytearray()
+        batch = ProgressBatch(progress, task_id)
+        try:
+            async with session.get(url, timeout=aiohttp.ClientTimeout(total=None)) as resp:
+                resp.raise_for_status()
+                async for chunk in resp.content.iter_chunked(SEGMENT_CHUNK_SIZE):
+                    data += chunk
+                    batch.advance(len(chunk))
+            batch.flush()
+            return data
         except Exception as e:
-            console.print(f"[yellow]Attempt {attempt} failed for {part_file}: {e}[/]")
-    console.print(f"[red]Giving up on {part_file} after {RETRIES} attempts[/]")
-
-async def merge_parts(final_file: str, parts: List[str]):
-    async with aiofiles.open(final_file, 'wb') as out:
-        for part in parts:
-            async with aiofiles.open(part, 'rb') as pf:
-                while chunk := await pf.read(FILE_CHUNK_SIZE):
-                    await out.write(chunk)
-            os.remove(part)
-
-async def parse_variants(master_url: str, master_text: str) -> List[Tuple[int,int,str,str,str,str]]:
+            batch.rollback()
+            console.print(f"[yellow]Attempt {attempt} failed for {os.path.basename(url)}: {e}[/]")
+            if attempt == RETRIES or not is_retryable(e):
+                raise
+            await asyncio.sleep(backoff_delay(attempt))
+
+class AdaptiveLimiter:
+    """Semaphore whose number of permits can be changed while tasks wait on it."""
+
+    def __init__(self, limit: int, minimum: int, maximum: int):
+        self.limit   = limit
+        self.minimum = minimum
+        self.maximum = maximum
+        self.active  = 0
+        self._cond   = asyncio.Condition()
+
+    async def acquire(self):
+        async with self._cond:
+            await self._cond.wait_for(lambda: self.active < self.limit)
+            self.active += 1
+
+    async def release(self):
+        async with self._cond:
+            self.active -= 1
+            self._cond.notify()
+
+    async def resize(self, delta: int) -> int:
+        async with self._cond:
+            self.limit = max(self.minimum, min(self.maximum, self.limit + delta))
+            self._cond.notify_all()
+            return self.limit
+
+async def tune_concurrency(limiter: AdaptiveLimiter, progress: Progress, task_id: int):
+    """Hill-climb the limiter on measured throughput: keep stepping while it improves, turn around when it drops."""
+    task  = next(t for t in progress.tasks if t.id == task_id)
+    step  = CONCURRENCY_STEP
+    rate  = 0.0
+    seen  = task.completed
+    stamp = time.monotonic()
+    while True:
+        await asyncio.sleep(CONCURRENCY_INTERVAL)
+        now      = time.monotonic()
+        new_rate = (task.completed - seen) / (now - stamp)
+        if new_rate < rate:
+            step = -step
+        await limiter.resize(step)
+        rate, seen, stamp = new_rate, task.completed, now
+
+async def stream_segments(session: aiohttp.ClientSession, segments: List[str], sink, window: int,
+                          progress: Progress, task_id: int) -> int:
+    """Download segments concurrently and hand them to `sink` in playlist order.
+
+    At most `window` segments are in flight or waiting to be written, which
+    bounds memory while a slow segment holds up the ones behind it. Within
+    that window the actual concurrency is tuned by `tune_concurrency`.
+    """
+    window  = max(1, window)
+    slots   = AdaptiveLimiter(min(CONCURRENCY_START, window), min(CONCURRENCY_MIN, window), window)
+    pending = asyncio.Queue()
+
+    async def produce():
+        for seg in segments:
+            await slots.acquire()
+            await pending.put(asyncio.ensure_future(fetch_segment(session, seg, progress, task_id)))
+        await pending.put(None)
+
+    producer = asyncio.ensure_future(produce())
+    tuner    = asyncio.ensure_future(tune_concurrency(slots, progress, task_id))
+    total    = 0
+    done     = 0
+    try:
+        while (task := await pending.get()) is not None:
+            data = await task
+            await sink(data)
+            await slots.release()
+            total += len(data)
+            done  += 1
+            # extrapolate the total from the average segment size so far
+            progress.update(task_id, total=total * len(segments) // done)
+    finally:
+        producer.cancel()
+        tuner.cancel()
+        while not pending.empty():
+            task = pending.get_nowait()
+            if task is None:
+                continue
+            if task.done() and not task.cancelled():
+                task.exception()  # already reported by fetch_segment
+            task.cancel()
+    return total
+
+async def watch_ffmpeg(proc: asyncio.subprocess.Process, progress: Progress, task_id: int) -> int:
+    """Follow ffmpeg's `-progress` key=value stream and report the muxed output size."""
+    size = 0
+    async for line in proc.stdout:
+        key, _, val = line.decode(errors="ignore").strip().partition("=")
+        if key == "total_size" and val.isdigit():
+            size = int(val)
+            progress.update(task_id, completed=size)
+    return size
+
+def parse_variants(master_url: str, master_text: str) -> List[Tuple[int,int,str,str,str,str]]:
     variants = []
-    if m3u8:
-        playlist = m3u8.loads(master_text, uri=master_url)
-        for idx, pl in enumerate(playlist.playlists, start=1):
-            si     = pl.stream_info
-            bw     = si.bandwidth or 0
-            res    = f"{si.resolution[0]}x{si.resolution[1]}" if si.resolution else "unknown"
-            fps    = str(int(si.frame_rate))         if si.frame_rate else "unknown"
-            codecs = si.codecs                       or "unknown"
-            variants.append((idx, bw, res, fps, codecs, pl.absolute_uri))
-    else:
-        lines = master_text.splitlines()
-        for i, line in enumerate(lines):
-            if line.startswith("#EXT-X-STREAM-INF"):
-                info = line
-                uri  = lines[i+1].strip() if i+1 < len(lines) else ""
-                if uri and not uri.startswith("#"):
-                    bw     = int(re.search(r"BANDWIDTH=(\d+)", info).group(1)) if "BANDWIDTH" in info else 0
-                    res    = re.search(r"RESOLUTION=(\d+x\d+)", info).group(1)      if "RESOLUTION" in info else "unknown"
-                    fps    = re.search(r"FRAME-RATE=([\d\.]+)", info).group(1)      if "FRAME-RATE" in info else "unknown"
-                    codecs = re.search(r'CODECS="([^"]+)"', info).group(1)         if "CODECS" in info else "unknown"
-                    variants.append((len(variants)+1, bw, res, fps, codecs, urljoin(master_url, uri)))
+    lines    = master_text.splitlines()
+    for i, info in enumerate(lines):
+        if not info.startswith("#EXT-X-STREAM-INF"):
+            continue
+        # peek at the next line without consuming it, so a tag there is still scanned
+        uri = lines[i+1].strip() if i+1 < len(lines) else ""
+        if uri and not uri.startswith("#"):
+            bw     = _RE_BW.search(info)
+            res    = _RE_RES.search(info)
+            fps    = _RE_FPS.search(info)
+            codecs = _RE_CODECS.search(info)
+            variants.append((
+                len(variants)+1,
+                int(bw.group(1)) if bw     else 0,
+                res.group(1)     if res    else "unknown",
+                fps.group(1)     if fps    else "unknown",
+                codecs.group(1)  if codecs else "unknown",
+                urljoin(master_url, uri)
+            ))
     return variants
 
-async def select_variant(variants):
+def select_by_height(variants, target):
+    # one pass: stop on an exact height, otherwise keep the first closest one
+    best, best_diff = None, None
+    for variant in variants:
+        res = variant[2]
+        if "x" not in res:
+            continue
+        diff = abs(int(res.rpartition("x")[2]) - target)
+        if diff == 0:
+            return variant, True
+        if best_diff is None or diff < best_diff:
+            best, best_diff = variant, diff
+    return best, False
+
+def select_variant(variants):
     # Display available tracks
     table = Table(title="Found Tracks", show_header=True, header_style="bold magenta", box=box.ROUNDED)
     table.add_column("Index", style="cyan", no_wrap=True)
@@ -123,57 +358,42 @@ async def select_variant(variants):
     # Check if preferred resolution is set
     preferred_res = getattr(main, "preferred_resolution", None)
     if preferred_res:
-        # Convert resolution like "1080" to "1920x1080" format for matching
-        target_height = int(preferred_res)
-        
-        # First try exact match
-        for variant in variants:
-            _, _, res, _, _, _ = variant
-            if "x" in res:
-                _, height = map(int, res.split("x"))
-                if height == target_height:
-                    console.print(f"[green]Selected {res} (exact match for {preferred_res}p)[/]\n")
-                    return variant
-        
-        # If no exact match, find closest resolution
-        closest = None
-        min_diff = float('inf')
-        for variant in variants:
-            _, _, res, _, _, _ = variant
-            if "x" in res:
-                _, height = map(int, res.split("x"))
-                diff = abs(height - target_height)
-                if diff < min_diff:
-                    min_diff = diff
-                    closest = variant
-        
-        if closest:
-            _, _, res, _, _, _ = closest
-            console.print(f"[yellow]Selected {res} (closest match to {preferred_res}p)[/]\n")
-            return closest
+        variant, exact = select_by_height(variants, int(preferred_res))
+        if variant:
+            res = variant[2]
+            if exact:
+                console.print(f"[green]Selected {res} (exact match for {preferred_res}p)[/]\n")
+            else:
+                console.print(f"[yellow]Selected {res} (closest match to {preferred_res}p)[/]\n")
+            return variant
         
         # Fallback to highest quality if no resolution could be parsed
         console.print(f"[yellow]Could not find matching resolution, defaulting to highest quality[/]\n")
         return variants[0]
 
     # If no preferred resolution, ask user to select
+    # no downloads are running yet, and a worker thread blocked in input() would keep the
+    # process alive after Ctrl-C, so this stays a plain blocking prompt
     choice = None
-    valid = [str(i) for i in range(1, len(variants)+1)]
+    valid  = [str(i) for i in range(1, len(variants)+1)]
     while choice not in valid:
         choice = console.input(f"[bold green]Select stream[/] [1–{len(variants)}]: ")
     console.print()  # blank line
 
     return variants[int(choice)-1]
 
-async def get_segment_urls(media_text: str, playlist_url: str) -> List[str]:
+def get_segment_urls(media_text: str, playlist_url: str) -> List[str]:
     base = playlist_url.rsplit("/", 1)[0] + "/"
-    lines = media_text.splitlines()
-    urls  = []
-    for i, line in enumerate(lines):
-        if line.startswith("#EXTINF") and i+1 < len(lines):
-            uri = lines[i+1].strip()
-            if uri and not uri.startswith("#"):
-                urls.append(urljoin(base, uri))
+    urls = []
+    for m in _RE_SEGMENT.finditer(media_text):
+        uri = m.group(1).strip()
+        # plain relative names (the common case) don't need a full urljoin
+        if "://" in uri:
+            urls.append(uri)
+        elif uri.startswith(("/", ".")):
+            urls.append(urljoin(base, uri))
+        else:
+            urls.append(base + uri)
     return urls
 
 async def main():
@@ -187,11 +407,23 @@ async def main():
         console.print("[red]Error: no source URL provided[/]")
         return
 
-    os.makedirs(output_dir, exist_ok=True)
+    ensure_dir(output_dir)
     start = time.time()
-    conn  = aiohttp.TCPConnector(limit=max_conn)
+    # keep DNS answers for the whole download instead of aiohttp's 5 minute default
+    conn  = aiohttp.TCPConnector(
+        limit=max_conn,
+        limit_per_host=max_conn,
+        use_dns_cache=True,
+        ttl_dns_cache=DNS_CACHE_TTL,
+        keepalive_timeout=60,
+        enable_cleanup_closed=True
+    )
+    # media is already compressed: ask for identity encoding and skip the decompressor
     async with aiohttp.ClientSession(connector=conn,
-                                     timeout=aiohttp.ClientTimeout(total=DEFAULT_CONNECT_TIMEOUT)) as session:
+                                     timeout=aiohttp.ClientTimeout(total=DEFAULT_CONNECT_TIMEOUT),
+                                     read_bufsize=READ_BUFFER_SIZE,
+                                     headers={"Accept-Encoding": "identity"},
+                                     auto_decompress=False) as session:
 
         if source_url.lower().endswith(".mp4"):
             # MP4 branch
@@ -200,13 +432,18 @@ async def main():
             console.print()
 
             part_sz = total // mp4_conn
-            parts   = []
+            ranges  = []
             base    = output_name or os.path.basename(source_url).rsplit(".",1)[0]
             for i in range(mp4_conn):
-                s  = i * part_sz
-                e  = (s + part_sz - 1) if i < mp4_conn-1 else total-1
-                pf = os.path.join(output_dir, f"{base}.part{i}")
-                parts.append((s, e, pf))
+                s = i * part_sz
+                e = (s + part_sz - 1) if i < mp4_conn-1 else total-1
+                if e >= s:
+                    ranges.append((s, e))
+
+            # every range is written in place into one preallocated file
+            final_mp4 = os.path.join(output_dir, f"{base}.mp4")
+            tmp_mp4   = final_mp4 + ".tmp"
+            create_sized(tmp_mp4, total)
 
             task_desc = f"[bright_blue]MP4 {base}[/]"
             with Progress(
@@ -217,12 +454,26 @@ async def main():
                 TimeRemainingColumn(),
                 console=console
             ) as p:
-                tid = p.add_task(task_desc, total=total)
-                await asyncio.gather(*(download_chunk(session, source_url, s, e, pf, p, tid) for s,e,pf in parts))
+                tid   = p.add_task(task_desc, total=total)
+                tasks = [asyncio.ensure_future(download_chunk(session, source_url, s, e, tmp_mp4, p, tid)) for s,e in ranges]
+                ok    = True
+                try:
+                    # one failed range dooms the file, so stop the rest as soon as it happens
+                    for fut in asyncio.as_completed(tasks):
+                        if not await fut:
+                            ok = False
+                            break
+                finally:
+                    for t in tasks:
+                        t.cancel()
+                    await asyncio.gather(*tasks, return_exceptions=True)
 
-            console.print()  # space before merge
-            final_mp4 = os.path.join(output_dir, f"{base}.mp4")
-            await merge_parts(final_mp4, [pf for _,_,pf in parts])
+            console.print()
+            if not ok:
+                os.remove(tmp_mp4)
+                console.print("[red]❌ Download incomplete[/]")
+                return
+            os.replace(tmp_mp4, final_mp4)
             console.print(f"[yellow] ✓ Done [/]")
             console.print()
 
@@ -231,8 +482,8 @@ async def main():
             console.print("Parsing Tracks…\n")
 
             master_text = await fetch_text(session, source_url)
-            variants    = await parse_variants(source_url, master_text)
-            idx, bw, res, fps, codecs, variant_url = await select_variant(variants)
+            variants    = parse_variants(source_url, master_text)
+            idx, bw, res, fps, codecs, variant_url = select_variant(variants)
 
             # remember resolution for naming
             main.selected_quality = res
@@ -241,88 +492,66 @@ async def main():
 
             console.print(f"Downloading {res} segments…\n")
             media_text = await fetch_text(session, variant_url)
-            segments   = await get_segment_urls(media_text, variant_url)
-            sizes      = await asyncio.gather(*(get_content_length(session, seg) for seg in segments))
-            total      = sum(sizes)
-
-            console.print(f"[bold]Total size:[/] {total/1024**2:.2f} MB\n")
-            task_desc = f"[bright_blue]VID {res}[/]"
-
-            # download all TS segments
-            with Progress(
-                TextColumn("{task.description}"),
-                BarColumn(),
-                DownloadColumn(),
-                TransferSpeedColumn(),
-                TimeRemainingColumn(),
-                console=console
-            ) as download_prog:
-                tid = download_prog.add_task(task_desc, total=total)
-                await asyncio.gather(
-                    *(download_chunk(
-                        session, seg, 0, sz-1,
-                        os.path.join(output_dir, os.path.basename(seg)),
-                        download_prog, tid
-                    ) for seg, sz in zip(segments, sizes))
-                )
+            segments   = get_segment_urls(media_text, variant_url)
+            task_desc  = f"[bright_blue]VID {res}[/]"
 
-            console.print("[yellow] ✓ Done [/]\n")
-
-            # write concat list
-            list_file = os.path.join(output_dir, "segments.txt")
-            async with aiofiles.open(list_file, 'w') as lf:
-                for seg in segments:
-                    fn = os.path.basename(seg)
-                    await lf.write(f"file '{fn}'\n")
-
-            # merge TS → MP4 with progress
+            # remux TS → MP4 while downloading; segments are fed to ffmpeg in order
             mp4_file = os.path.join(
                 output_dir,
                 f"{(output_name or os.path.basename(variant_url).rsplit('.',1)[0])}.mp4"
             )
             cmd = [
-                FFMPEG_CMD, "-y", "-f", "concat", "-safe", "0",
-                "-i", list_file, "-c", "copy", mp4_file
+                FFMPEG_CMD, "-y", "-nostats", "-progress", "pipe:1",
+                "-f", "mpegts", "-i", "-", "-c", "copy", mp4_file
             ]
             proc = await asyncio.create_subprocess_exec(
                 *cmd,
-                stdout=asyncio.subprocess.DEVNULL,
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
                 stderr=asyncio.subprocess.DEVNULL
             )
 
             with Progress(
-                TextColumn("[bold green]Merging[/]"),
+                TextColumn("{task.description}"),
                 BarColumn(),
+                DownloadColumn(),
                 TransferSpeedColumn(),
                 TimeRemainingColumn(),
                 console=console
-            ) as merge_prog:
-                mid = merge_prog.add_task("merge", total=total)
-                while proc.returncode is None:
-                    if os.path.exists(mp4_file):
-                        merge_prog.update(mid, completed=os.path.getsize(mp4_file))
-                    await asyncio.sleep(0.1)
-                if os.path.exists(mp4_file):
-                    merge_prog.update(mid, completed=os.path.getsize(mp4_file))
+            ) as download_prog:
+                tid = download_prog.add_task(task_desc, total=None)
+                mid = download_prog.add_task("[bold green]Merging[/]", total=None)
+                watcher = asyncio.ensure_future(watch_ffmpeg(proc, download_prog, mid))
+
+                async def feed(data: bytearray):
+                    proc.stdin.write(data)
+                    await proc.stdin.drain()
+
+                try:
+                    total = await stream_segments(session, segments, feed, REORDER_WINDOW, download_prog, tid)
+                    download_prog.update(tid, total=total)
+                    proc.stdin.close()
+                    await proc.stdin.wait_closed()
+                    muxed = await watcher or total
+                    download_prog.update(mid, total=muxed, completed=muxed)
+                except Exception as e:
+                    watcher.cancel()
+                    proc.kill()
+                    await proc.wait()
+                    try:
+                        os.remove(mp4_file)
+                    except OSError:
+                        pass
+                    console.print(f"[red]❌ Download failed: {e}[/]")
+                    return
 
             rc = await proc.wait()
             if rc != 0:
                 console.print(f"[red]❌ Merge failed (exit {rc})[/]")
                 return
 
-            # cleanup TS and list file
-            for fn in os.listdir(output_dir):
-                if fn.endswith(".ts"):
-                    try:
-                        os.remove(os.path.join(output_dir, fn))
-                    except OSError:
-                        pass
-            try:
-                os.remove(list_file)
-            except OSError:
-                pass
-
-            console.print("[yellow] ✓ Cleaned [/]\n")
+            console.print(f"[bold]Total size:[/] {total/1024**2:.2f} MB")
+            console.print("[yellow] ✓ Done [/]\n")
             console.print()
 
 if __name__ == "__main__":
@@ -5,19 +5,33 @@ import json
 import time
 import argparse
 import requests
+from requests.adapters import HTTPAdapter
 import subprocess
 import asyncio
 import platform
 import shutil
+import concurrent.futures
+import functools
 
 import dl  # downloader module
 
 from rich.console import Console
 from rich.progress import Progress, BarColumn, TransferSpeedColumn, TimeElapsedColumn, TextColumn
 
+# Optional faster JSON decoding
+try:
+    import orjson
+    json_loads = orjson.loads
+except ImportError:
+    json_loads = json.loads
+
 if platform.system() == "Windows":
     asyncio.set_event_loop_policy(asyncio.WindowsProactorEventLoopPolicy())
 
+# one event loop for every dl.main() run, instead of a fresh asyncio.run() per episode
+LOOP = asyncio.new_event_loop()
+asyncio.set_event_loop(LOOP)
+
 # ─── find muxer/extractor executables ─────────────────────────────────────────────────────────
 MKVMERGE_CMD = shutil.which("mkvmerge") or "mkvmerge"
 # (we don't actually call ffmpeg here, but if you ever do, add the same pattern)
@@ -45,7 +59,25 @@ SERIES_FOLDER_TPL = cfg["NAMING"]["series_folder"]
 SERIES_FILE_TPL   = cfg["NAMING"]["series_file"]
 # ——————————————————————————————————————————————————————————————————————————————
 
-console = Console()
+# — Shared HTTP session (keep-alive pool for the site, API and CDN hosts) —————————
+SESSION = requests.Session()
+SESSION.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=32))
+# requests' default Accept-Encoding already advertises br once brotli is installed
+SESSION.headers.update({"User-Agent": "Mozilla/5.0", **SITEID_HEADER})
+
+# metadata calls are pure I/O, so fan them out over a few threads sharing SESSION's pool
+EXECUTOR = concurrent.futures.ThreadPoolExecutor(max_workers=8)
+
+# Optional on-disk cache of per-video API responses, so re-runs skip the lookups
+try:
+    import diskcache
+    API_CACHE = diskcache.Cache(os.path.expanduser("~/.hcrip_cache"))
+except ImportError:
+    API_CACHE = None
+API_CACHE_TTL = 3600
+# ——————————————————————————————————————————————————————————————————————————————
+
+console = Console(highlight=False)
 
 # —── Banner —────────────────────────────────────────────────────────────────────────────────
 console.print(r"""
@@ -68,6 +100,11 @@ TITLE_RE = re.compile(
     r'(?P<id>/(?:movies|movie|films|shows|webseries)/[a-z0-9\-/]+)',
     re.IGNORECASE
 )
+_PUSH_RE   = re.compile(r'self\.__next_f\.push\(\[1,"(.*?)"\]\)', re.DOTALL)
+_RAW_RE    = re.compile(r"/Renditions/(\d{8})/")
+_SANI_TBL  = str.maketrans("", "", '\\/*?:"<>|,!\'')
+_SANI_DOTS = re.compile(r'\.+')
+_SANI_TRIM = re.compile(r'^[\W.]+|[\W.]+$')
 
 def extract_path(url: str) -> str:
     m = TITLE_RE.match(url)
@@ -79,14 +116,29 @@ def extract_path(url: str) -> str:
         return q[0]
     raise ValueError("Invalid Hoichoi URL")
 
+def api_get(url: str, params: dict):
+    """GET a JSON API endpoint, served from the on-disk cache when available."""
+    key = (url, tuple(sorted(params.items())))
+    if API_CACHE is not None:
+        hit = API_CACHE.get(key)
+        if hit is not None:
+            return hit
+    resp = SESSION.get(url, params=params, timeout=10)
+    data = json_loads(resp.content)
+    if API_CACHE is not None and resp.ok:
+        API_CACHE.set(key, data, expire=API_CACHE_TTL)
+    return data
+
 def fetch_page_metadata(path: str) -> dict:
-    resp = requests.get("https://hoichoi.tv" + path, headers={"User-Agent": "Mozilla/5.0"}, timeout=10)
+    resp = SESSION.get("https://hoichoi.tv" + path, timeout=10)
     resp.raise_for_status()
-    pushes = re.findall(r'self\.__next_f\.push\(\[1,"([\s\S]*?)"\]\)', resp.text)
+    pushes = _PUSH_RE.findall(resp.text)
     blob = max(pushes, key=len).split(":", 1)[1]
-    details = json.loads(blob.encode("utf-8").decode("unicode_escape"))[3]["detailsData"]
+    # the push payload is a JS string literal; decode it as a JSON string first, then parse it
+    details = json_loads(json_loads('"' + blob + '"'))[3]["detailsData"]
+    # serialize first and write once; json.dump issues a write per token
     with open(f'{details.get("title", "debug")}.json', "w", encoding="utf-8") as f:
-        json.dump(details, f, indent=4, ensure_ascii=False)
+        f.write(json.dumps(details, indent=4, ensure_ascii=False))
     return {
         "title": details.get("title", ""),
         "contentType": details.get("contentType", ""),
@@ -94,9 +146,9 @@ def fetch_page_metadata(path: str) -> dict:
         "releaseYear": details.get("releaseYear", "")
     }
 
+@functools.lru_cache(maxsize=512)
 def fetch_manifest(cid: str) -> str:
-    resp = requests.get(VIDEO_API_URL, params={"platform": "ROKU", "language": "english", "contentIds": cid}, headers=SITEID_HEADER, timeout=10)
-    data = resp.json()
+    data = api_get(VIDEO_API_URL, {"platform": "ROKU", "language": "english", "contentIds": cid})
     if isinstance(data, list):
         data = data[0]
     rend = data.get("renditions", [])
@@ -104,54 +156,74 @@ def fetch_manifest(cid: str) -> str:
         return rend[0]["mainManifestUrl"].replace("hoichoicdn.com", "vhoichoi.viewlift.com")
     return ""
 
-def fetch_captions(cid: str) -> list:
-    resp = requests.get(VIDEO_API_URL, params={"platform": "LG", "language": "english", "contentIds": cid}, headers=SITEID_HEADER, timeout=10)
-    arr = resp.json()
-    if isinstance(arr, list):
-        arr = arr[0]
-    return arr.get("closedCaptions", [])
-
-def fetch_audio_languages(cid: str) -> list:
-    resp = requests.get(VIDEO_API_URL, params={"platform": "LG", "language": "english", "contentIds": cid}, headers=SITEID_HEADER, timeout=10)
-    arr = resp.json()
+@functools.lru_cache(maxsize=512)
+def fetch_video_meta(cid: str) -> tuple:
+    """Return (closedCaptions, audioLanguages) for a video from one API call."""
+    arr = api_get(VIDEO_API_URL, {"platform": "LG", "language": "english", "contentIds": cid})
     if isinstance(arr, list):
         arr = arr[0]
-    return arr.get("audioLanguages", [])
+    return arr.get("closedCaptions", []), arr.get("audioLanguages", [])
 
 def sanitize(s: str) -> str:
-    # Remove disallowed special characters
-    s = re.sub(r'[\\/*?:"<>|,!\']', "", s)
-    # Replace spaces with dots
-    s = s.replace(" ", ".")
+    # Remove disallowed special characters, replace spaces with dots
+    s = s.translate(_SANI_TBL).replace(" ", ".")
     # Replace multiple dots with a single dot
-    s = re.sub(r'\.+', ".", s)
+    s = _SANI_DOTS.sub(".", s)
     # Trim leading/trailing dots and non-word characters
-    s = re.sub(r'^[\W.]+|[\W.]+$', "", s)
+    s = _SANI_TRIM.sub("", s)
     return s
 
+def parse_range(spec: str, hi: int) -> list:
+    """Parse a selection like '1-3,5' or 'all' into numbers within 1..hi."""
+    spec = re.sub(r"\s*-\s*", "-", spec.strip().lower())
+    if spec in ("all", "a"):
+        return list(range(1, hi + 1))
+    picked = []
+    for part in re.split(r"[,\s]+", spec):
+        if not part:
+            continue
+        lo, dash, top = part.partition("-")
+        lo  = int(lo)
+        top = int(top) if dash else lo
+        if not 1 <= lo <= top <= hi:
+            raise ValueError(f"'{part}' is outside 1-{hi}")
+        picked += range(lo, top + 1)
+    if not picked:
+        raise ValueError("nothing selected")
+    return picked
+
+def ask_range(prompt: str, hi: int) -> list:
+    """Prompt until the answer parses with parse_range."""
+    while True:
+        try:
+            return parse_range(input(prompt), hi)
+        except ValueError as e:
+            console.print(f"[red]Invalid selection: {e}[/]")
+
 def fetch_series_data(series_id: str) -> list:
     """Fetch all episodes for each season of a series."""
-    resp = requests.get(CONTENT_API_URL, params={"platform": "LG", "language": "english", "contentIds": series_id}, headers=SITEID_HEADER, timeout=10)
-    arr = resp.json()
+    resp = SESSION.get(CONTENT_API_URL, params={"platform": "LG", "language": "english", "contentIds": series_id}, timeout=10)
+    arr = json_loads(resp.content)
     if not arr or "seasons" not in arr[0]:
         return []
     seasons = []
     for season in arr[0]["seasons"]:
-        eps = []
-        for ep in season.get("episodes", []):
-            cid = ep.get("contentId", "")
-            eps.append({
-                "title": ep.get("title", ""),
-                "contentId": cid,
-                "manifest": fetch_manifest(cid)
-            })
+        eps = [{"title": ep.get("title", ""), "contentId": ep.get("contentId", "")} for ep in season.get("episodes", [])]
         seasons.append({"episodes": eps})
+    # manifests are resolved later, only for the episodes the user picks
     return seasons
 
+def download_file(url: str, path: str):
+    """Stream a (subtitle) file to disk in large blocks."""
+    with SESSION.get(url, stream=True, timeout=10) as r:
+        r.raw.decode_content = True
+        with open(path, "wb") as f:
+            shutil.copyfileobj(r.raw, f, 1024 * 1024)
+
 def progress(mp4_in: str, mkv_out: str, audio_lang=None, srt_path=None, srt_lang=None):
     """Display muxing progress using rich progress bar."""
     total = os.path.getsize(mp4_in)
-    cmd = [MKVMERGE_CMD, "-o", mkv_out]
+    cmd = [MKVMERGE_CMD, "--gui-mode", "-o", mkv_out]
     if audio_lang:
         cmd += ["--language", f"1:{audio_lang}"]
     cmd.append(mp4_in)
@@ -163,50 +235,37 @@ def progress(mp4_in: str, mkv_out: str, audio_lang=None, srt_path=None, srt_lang
         TextColumn("[bold green]Muxing[/]"), BarColumn(), TransferSpeedColumn(), TimeElapsedColumn(), console=console
     ) as prog:
         task = prog.add_task("mux", total=total)
-        while proc.poll() is None:
-            if os.path.exists(mkv_out):
-                prog.update(task, completed=os.path.getsize(mkv_out))
-            time.sleep(0.1)
-        prog.update(task, completed=os.path.getsize(mkv_out))
-    out, _ = proc.communicate()
+        # --gui-mode reports "#GUI#progress N%" lines; block on them instead of polling the output size
+        out = []
+        for line in proc.stdout:
+            if line.startswith("#GUI#progress "):
+                pct = int(line[14:].strip().rstrip("%") or 0)
+                prog.update(task, completed=pct * total // 100)
+            else:
+                out.append(line)
+        proc.wait()
     if proc.returncode != 0:
         console.print(f"[bold red]mkvmerge failed (exit {proc.returncode})[/]")
-        console.print(out)
+        console.print("".join(out))
         sys.exit(1)
 
-def download_and_mux(manifest_url: str, out_dir: str, context: dict, captions: list, audio_langs: list, maxc: int, mp4c: int, preferred_resolution=None):
-    """Download stream and mux subtitles/audio into MKV."""
-    start = time.time()
-    os.makedirs(out_dir, exist_ok=True)
-    dl.main.source_url = manifest_url
-    dl.main.output_dir = out_dir
-    dl.main.max_connections = maxc
-    dl.main.mp4_connections = mp4c
-    dl.main.output_name = "temp_vid"
-    if preferred_resolution:
-        dl.main.preferred_resolution = preferred_resolution
-    asyncio.run(dl.main())
-
-    mp4_in = os.path.join(out_dir, "temp_vid.mp4")
-    if not os.path.exists(mp4_in):
-        console.print(f"[red]Downloaded file missing: {mp4_in}[/]")
-        sys.exit(1)
-
-    # Subtitle download
-    srt_path = None; srt_lang = None
+def fetch_subtitle(captions: list, out_dir: str):
+    """Download the first available SRT; returns (srt_path, srt_lang) or (None, None)."""
     for cap in captions:
         if cap.get("srtFile"):
             try:
                 raw = cap["language"].lower()
                 srt_lang = LANG_SUB.get(raw, raw[:3])
-                srt_path = os.path.join(out_dir, f"temp_sub.{srt_lang}.srt")
-                r = requests.get(cap["srtFile"], stream=True, timeout=10)
-                with open(srt_path, "wb") as f:
-                    for chunk in r.iter_content(8192):
-                        f.write(chunk)
-                break
+                srt_path = f"{out_dir}{os.sep}temp_sub.{srt_lang}.srt"
+                download_file(cap["srtFile"], srt_path)
+                return srt_path, srt_lang
             except:
                 continue
+    return None, None
+
+def mux_output(mp4_in: str, out_dir: str, context: dict, quality: str, captions: list, audio_langs: list) -> str:
+    """Mux a downloaded MP4 with subtitles/audio language into the final MKV; returns its name."""
+    srt_path, srt_lang = fetch_subtitle(captions, out_dir)
 
     # Audio language selection
     audio_lang = None
@@ -215,22 +274,107 @@ def download_and_mux(manifest_url: str, out_dir: str, context: dict, captions: l
         audio_lang = LANG_AUD.get(raw, raw)
 
     # Final output name
-    raw_q = getattr(dl.main, "selected_quality", "1080p")
-    quality = f"{raw_q.split('x')[1]}p" if "x" in raw_q else raw_q
     tpl = MOVIE_TMPL if context["type"] == "movie" else SERIES_FILE_TPL
     final_name = tpl.format(**{**context, "quality": quality, "lang_aud": audio_lang or "unk"})
-    mkv_out = os.path.join(out_dir, final_name)
+    mkv_out = f"{out_dir}{os.sep}{final_name}"
 
     progress(mp4_in, mkv_out, audio_lang, srt_path, srt_lang)
 
     # Cleanup
-    os.remove(mp4_in)
-    if srt_path and os.path.exists(srt_path):
-        os.remove(srt_path)
+    for path in (mp4_in, srt_path):
+        if path:
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                console.print(f"[yellow]Warning: Could not clean up temporary files: {e}[/]")
+    return final_name
+
+def download_and_mux(manifest_url: str, out_dir: str, context: dict, captions: list, audio_langs: list, maxc: int, mp4c: int, preferred_resolution=None):
+    """Download stream and mux subtitles/audio into MKV."""
+    start = time.time()
+    dl.ensure_dir(out_dir)
+    dl.main.source_url = manifest_url
+    dl.main.output_dir = out_dir
+    dl.main.max_connections = maxc
+    dl.main.mp4_connections = mp4c
+    dl.main.output_name = "temp_vid"
+    if preferred_resolution:
+        dl.main.preferred_resolution = preferred_resolution
+    LOOP.run_until_complete(dl.main())
+
+    mp4_in = f"{out_dir}{os.sep}temp_vid.mp4"
+    if not os.path.exists(mp4_in):
+        console.print(f"[red]Downloaded file missing: {mp4_in}[/]")
+        sys.exit(1)
+
+    raw_q = getattr(dl.main, "selected_quality", "1080p")
+    quality = f"{raw_q.split('x')[1]}p" if "x" in raw_q else raw_q
+    final_name = mux_output(mp4_in, out_dir, context, quality, captions, audio_langs)
 
     console.print(f"[yellow] ✓ Muxed:[/] {final_name}")
     console.print(f"[bold]Completed in {time.time() - start:.1f}s\n")
 
+def probe_raw(manifest: str) -> tuple:
+    """HEAD the RAW MP4 behind an HLS manifest. Returns (raw_url, None) if it exists, else (None, reason)."""
+    m = _RAW_RE.search(manifest)
+    if not m:
+        return None, "Cannot derive RAW URL"
+    ymd = m.group(1)
+    stem = manifest.rpartition("/")[2].rpartition(".")[0]
+    raw_url = f"https://vhoichoi.viewlift.com/MezzFiles/{ymd[:4]}/{ymd[4:6]}/{stem}.mp4"
+    try:
+        head = SESSION.head(raw_url, timeout=10)
+    except requests.RequestException as e:
+        return None, f"Error checking RAW file: {e}"
+    if head.status_code != 200:
+        return None, f"RAW not available (HTTP {head.status_code})"
+    return raw_url, None
+
+def fetch_episode_source(cid: str, raw: bool) -> tuple:
+    """Resolve an episode's manifest and, if raw is set, probe its RAW MP4 in the same worker."""
+    manifest = fetch_manifest(cid)
+    return manifest, (probe_raw(manifest) if raw else None)
+
+def try_raw(manifest: str, out_dir: str, out_stem: str, context: dict, captions: list, audio_langs: list, maxc: int, mp4c: int, probe=None) -> bool:
+    """Download and mux the RAW MP4 behind an HLS manifest. Returns False if the caller should fall back to HLS.
+
+    probe is an earlier probe_raw(manifest) result; without one the RAW file is checked here.
+    """
+    if probe is None:
+        console.print("[bold]Checking for RAW file…[/]")
+        probe = probe_raw(manifest)
+    raw_url, reason = probe
+    if not raw_url:
+        console.print(f"[red]{reason}, falling back…[/]\n")
+        return False
+
+    console.print("[green]RAW file found! Proceeding with download...[/]\n")
+    dl.main.source_url = raw_url
+    dl.main.output_dir = out_dir
+    dl.main.output_name = out_stem
+    dl.main.max_connections = maxc
+    dl.main.mp4_connections = mp4c
+    LOOP.run_until_complete(dl.main())
+
+    mp4_in = f"{out_dir}{os.sep}{out_stem}.mp4"
+    if not os.path.exists(mp4_in):
+        console.print("[red]RAW download failed, falling back…[/]\n")
+        return False
+    final_name = mux_output(mp4_in, out_dir, context, "RAW", captions, audio_langs)
+    console.print(f"[yellow] ✓ Muxed RAW File:[/] {final_name}\n")
+    return True
+
+def close_loop():
+    """Cancel leftover tasks and close LOOP, as asyncio.run() would."""
+    pending = asyncio.all_tasks(LOOP)
+    for task in pending:
+        task.cancel()
+    LOOP.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+    LOOP.run_until_complete(LOOP.shutdown_asyncgens())
+    LOOP.close()
+
 def main():
     parser = argparse.ArgumentParser(description="Hoichoi metadata + downloader")
     parser.add_argument("url", help="Hoichoi movie or series URL")
@@ -241,8 +385,8 @@ def main():
     parser.add_argument("--mp4-connections", type=int, default=dl.DEFAULT_MP4_CONNECTIONS)
     parser.add_argument("--tag", default=DEFAULT_TAG)
     parser.add_argument("-r", "--resolution", help="Auto-select resolution (e.g., 720, 1080) without manual selection")
-    parser.add_argument("-s", "--season", help="Auto-select season(s) (e.g., 1, 2, or 'all') without manual selection")
-    parser.add_argument("-e", "--episode", help="Auto-select episode(s) (e.g., 1, 2-8, or 'all') without manual selection")
+    parser.add_argument("-s", "--season", help="Auto-select season(s) (e.g., 1, 1-3, 1,3 or 'all') without manual selection")
+    parser.add_argument("-e", "--episode", "--episodes", help="Auto-select episode(s) in every selected season (e.g., 1, 2-8, 1-3,5 or 'all') without manual selection")
     args = parser.parse_args()
 
     try:
@@ -277,25 +421,14 @@ def main():
 
         # Auto-select seasons if -s parameter is provided
         if args.season:
-            season_input = args.season.strip().lower()
-            if season_input in ("all", "a"):
-                sel_seasons = list(range(1, len(seasons)+1))
-                console.print(f"[green]Auto-selected: All seasons ({len(seasons)} seasons)[/]")
-            else:
-                try:
-                    season_num = int(season_input)
-                    if 1 <= season_num <= len(seasons):
-                        sel_seasons = [season_num]
-                        console.print(f"[green]Auto-selected: Season {season_num:02d}[/]")
-                    else:
-                        console.print(f"[red]Error: Season {season_num} not available. Available seasons: 1-{len(seasons)}[/]")
-                        sys.exit(1)
-                except ValueError:
-                    console.print(f"[red]Error: Invalid season format '{args.season}'. Use a number (1, 2, etc.) or 'all'[/]")
-                    sys.exit(1)
+            try:
+                sel_seasons = parse_range(args.season, len(seasons))
+            except ValueError as e:
+                console.print(f"[red]Error: Invalid season selection '{args.season}' ({e}). Use 1, 1-3, 1,3 or 'all'[/]")
+                sys.exit(1)
+            console.print(f"[green]Auto-selected: Season(s) {', '.join(f'{n:02d}' for n in sel_seasons)}[/]")
         else:
-            raw = input("Select seasons (e.g. 1,3 or all): ").strip().lower()
-            sel_seasons = list(range(1, len(seasons)+1)) if raw in ("all", "a") else [int(x) for x in re.split(r"[,\s]+", raw) if x.isdigit()]
+            sel_seasons = ask_range("Select seasons (e.g. 1,3 or all): ", len(seasons))
 
         for si in sel_seasons:
             eps = seasons[si-1]["episodes"]
@@ -303,177 +436,67 @@ def main():
             for j, ep in enumerate(eps, start=1):
                 console.print(f"  {j}. {ep['title']}")
 
-            # Auto-select episodes if -e parameter is provided
+            # Auto-select episodes if -e parameter is provided (applies to every selected season)
             if args.episode:
-                episode_input = args.episode.strip().lower()
-                if episode_input in ("all", "a"):
-                    sel_eps = list(range(1, len(eps)+1))
-                    console.print(f"[green]Auto-selected: All episodes ({len(eps)} episodes) for Season {si:02d}[/]")
-                else:
-                    sel_eps = []
-                    try:
-                        # Handle range format (e.g., "2-8")
-                        if "-" in episode_input:
-                            start, end = episode_input.split("-", 1)
-                            start_ep = int(start.strip())
-                            end_ep = int(end.strip())
-                            if 1 <= start_ep <= len(eps) and 1 <= end_ep <= len(eps) and start_ep <= end_ep:
-                                sel_eps = list(range(start_ep, end_ep + 1))
-                                console.print(f"[green]Auto-selected: Episodes {start_ep}-{end_ep} for Season {si:02d}[/]")
-                            else:
-                                console.print(f"[red]Error: Episode range {start_ep}-{end_ep} not valid for Season {si:02d}. Available episodes: 1-{len(eps)}[/]")
-                                sys.exit(1)
-                        # Handle single episode format (e.g., "1")
-                        else:
-                            episode_num = int(episode_input)
-                            if 1 <= episode_num <= len(eps):
-                                sel_eps = [episode_num]
-                                console.print(f"[green]Auto-selected: Episode {episode_num} for Season {si:02d}[/]")
-                            else:
-                                console.print(f"[red]Error: Episode {episode_num} not available for Season {si:02d}. Available episodes: 1-{len(eps)}[/]")
-                                sys.exit(1)
-                    except ValueError:
-                        console.print(f"[red]Error: Invalid episode format '{args.episode}'. Use a number (1), range (2-8), or 'all'[/]")
-                        sys.exit(1)
+                try:
+                    sel_eps = parse_range(args.episode, len(eps))
+                except ValueError as e:
+                    console.print(f"[red]Error: Invalid episode selection '{args.episode}' for Season {si:02d} ({e}). Use 1, 2-8, 1-3,5 or 'all'[/]")
+                    sys.exit(1)
+                console.print(f"[green]Auto-selected: Episode(s) {', '.join(map(str, sel_eps))} for Season {si:02d}[/]")
             else:
-                # Manual episode selection (original behavior)
-                raw_ep = input(f"Select episodes for S{si:02d} (e.g. 1-3 or all): ").strip().lower()
-                sel_eps = list(range(1, len(eps)+1)) if raw_ep in ("all", "a") else []
-                for part in raw_ep.split(","):
-                    if "-" in part:
-                        lo, hi = part.split("-", 1)
-                        sel_eps += range(int(lo), int(hi)+1)
-                    elif part.isdigit():
-                        sel_eps.append(int(part))
+                sel_eps = ask_range(f"Select episodes for S{si:02d} (e.g. 1-3 or all): ", len(eps))
 
             folder = SERIES_FOLDER_TPL.format(title=safe, season=si, tag=args.tag)
             season_dir = os.path.join(args.output_dir, folder)
-            os.makedirs(season_dir, exist_ok=True)
+            dl.ensure_dir(season_dir)
 
-            for ei in sel_eps:
-                ep = eps[ei-1]
-                base = {
-                    "type": "series", "title": safe, "season": si, "episode": ei,
-                    "episode_title": sanitize(ep["title"]), "year": year, "tag": args.tag
-                }
+            # prefetch manifests (plus RAW probes with --raw) and captions/audio for the selected
+            # episodes in the background; each episode only waits on its own lookups, the rest
+            # resolve while it downloads/muxes
+            sel_cids = [eps[ei-1]["contentId"] for ei in sel_eps if 1 <= ei <= len(eps)]
+            sources  = {c: EXECUTOR.submit(fetch_episode_source, c, args.raw) for c in sel_cids}
+            metas    = {c: EXECUTOR.submit(fetch_video_meta, c) for c in sel_cids}
 
-                try:
-                    caps = fetch_captions(ep["contentId"])
-                    auds = fetch_audio_languages(ep["contentId"])
-                except Exception as e:
-                    console.print(f"[red]Failed fetching audio/subs: {e}[/]")
-                    continue
-
-                # Use RAW if requested
-                if args.raw:
-                    raw_match = re.search(r"/Renditions/(\d{8})/", ep["manifest"])
-                    if raw_match:
-                        ymd = raw_match.group(1)
-                        stem = os.path.basename(ep["manifest"]).rsplit(".", 1)[0]
-                        raw_url = f"https://vhoichoi.viewlift.com/MezzFiles/{ymd[:4]}/{ymd[4:6]}/{stem}.mp4"
-                        console.print("[bold]Checking for RAW file…[/]")
-                        try:
-                            head = requests.head(raw_url, timeout=10)
-                            if head.status_code == 200:
-                                console.print("[green]RAW file found! Proceeding with download...[/]\n")
-                                dl.main.source_url = raw_url
-                                dl.main.output_dir = season_dir
-                                dl.main.output_name = f"S{si:02d}E{ei:02d}"
-                                dl.main.max_connections = args.max_connections
-                                dl.main.mp4_connections = args.mp4_connections
-                                asyncio.run(dl.main())
-
-                                mp4_in = os.path.join(season_dir, f"S{si:02d}E{ei:02d}.mp4")
-                                srt_path, srt_lang = None, None
-                                for cap in caps:
-                                    if cap.get("srtFile"):
-                                        raw_l = cap["language"].lower()
-                                        srt_lang = LANG_SUB.get(raw_l, raw_l[:3])
-                                        srt_path = os.path.join(season_dir, f"temp_sub.{srt_lang}.srt")
-                                        r = requests.get(cap["srtFile"], stream=True, timeout=10)
-                                        with open(srt_path, "wb") as f:
-                                            for chunk in r.iter_content(8192): f.write(chunk)
-                                        break
-                                audio_lang = LANG_AUD.get(auds[0].lower(), auds[0].lower()) if auds else None
-                                quality = "RAW"
-                                final_name = SERIES_FILE_TPL.format(**{**base, "quality": quality, "lang_aud": audio_lang or "unk"})
-                                mkv_out = os.path.join(season_dir, final_name)
-                                progress(mp4_in, mkv_out, audio_lang, srt_path, srt_lang)
-                                try:
-                                    os.remove(mp4_in)
-                                    if srt_path: os.remove(srt_path)
-                                except OSError as e:
-                                    console.print(f"[yellow]Warning: Could not clean up temporary files: {e}[/]")
-                                console.print(f"[yellow] ✓ Muxed RAW File:[/] {final_name}\n")
-                                continue
-                            else:
-                                console.print(f"[red]RAW not available (HTTP {head.status_code}), falling back…[/]\n")
-                        except requests.RequestException as e:
-                            console.print(f"[red]Error checking RAW file: {e}, falling back…[/]\n")
-                    else:
-                        console.print("[red]Cannot derive RAW URL, falling back…[/]\n")
-
-                # Standard HLS path
-                try:
-                    download_and_mux(ep["manifest"], season_dir, base, caps, auds, args.max_connections, args.mp4_connections, args.resolution)
-                except Exception as e:
-                    console.print(f"[red]Failed: {e}[/]")
+            try:
+                for ei in sel_eps:
+                    ep = eps[ei-1]
+                    base = {
+                        "type": "series", "title": safe, "season": si, "episode": ei,
+                        "episode_title": sanitize(ep["title"]), "year": year, "tag": args.tag
+                    }
+
+                    try:
+                        manifest, raw_probe = sources[ep["contentId"]].result()
+                        caps, auds = metas[ep["contentId"]].result()
+                    except Exception as e:
+                        console.print(f"[red]Failed fetching manifest/audio/subs: {e}[/]")
+                        continue
+
+                    # Use RAW if requested
+                    if args.raw and try_raw(manifest, season_dir, f"S{si:02d}E{ei:02d}", base, caps, auds, args.max_connections, args.mp4_connections, raw_probe):
+                        continue
+
+                    # Standard HLS path
+                    try:
+                        download_and_mux(manifest, season_dir, base, caps, auds, args.max_connections, args.mp4_connections, args.resolution)
+                    except Exception as e:
+                        console.print(f"[red]Failed: {e}[/]")
+            finally:
+                # drop lookups that never started, so an early exit doesn't wait on the queue
+                for fut in (*sources.values(), *metas.values()):
+                    fut.cancel()
 
     elif args.download:  # Movie
         manifest = fetch_manifest(cid)
-        if args.raw:
-            m = re.search(r"/Renditions/(\d{8})/", manifest)
-            if m:
-                ymd = m.group(1)
-                stem = os.path.basename(manifest).rsplit(".", 1)[0]
-                raw_url = f"https://vhoichoi.viewlift.com/MezzFiles/{ymd[:4]}/{ymd[4:6]}/{stem}.mp4"
-                console.print("[bold]Checking for RAW file…[/]")
-                try:
-                    head = requests.head(raw_url, timeout=10)
-                    if head.status_code == 200:
-                        console.print("[green]RAW file found! Proceeding with download...[/]\n")
-                        dl.main.source_url = raw_url
-                        dl.main.output_dir = args.output_dir
-                        dl.main.output_name = safe
-                        dl.main.max_connections = args.max_connections
-                        dl.main.mp4_connections = args.mp4_connections
-                        asyncio.run(dl.main())
-
-                        mp4_in = os.path.join(args.output_dir, f"{safe}.mp4")
-                        caps = fetch_captions(cid)
-                        srt_path, srt_lang = None, None
-                        for cap in caps:
-                            if cap.get("srtFile"):
-                                raw_l = cap["language"].lower()
-                                srt_lang = LANG_SUB.get(raw_l, raw_l[:3])
-                                srt_path = os.path.join(args.output_dir, f"temp_sub.{srt_lang}.srt")
-                                r = requests.get(cap["srtFile"], stream=True, timeout=10)
-                                with open(srt_path, "wb") as f:
-                                    for chunk in r.iter_content(8192): f.write(chunk)
-                                break
-                        auds = fetch_audio_languages(cid)
-                        audio_lang = LANG_AUD.get(auds[0].lower(), auds[0].lower()) if auds else None
-                        quality = "RAW"
-                        tpl_ctx = {"type": "movie", "title": safe, "year": year, "quality": quality, "tag": args.tag, "lang_aud": audio_lang or "unk"}
-                        final_name = MOVIE_TMPL.format(**tpl_ctx)
-                        mkv_out = os.path.join(args.output_dir, final_name)
-                        progress(mp4_in, mkv_out, audio_lang, srt_path, srt_lang)
-                        try:
-                            os.remove(mp4_in)
-                            if srt_path: os.remove(srt_path)
-                        except OSError as e:
-                            console.print(f"[yellow]Warning: Could not clean up temporary files: {e}[/]")
-                        console.print(f"[yellow] ✓ Muxed RAW File:[/] {final_name}\n")
-                        return
-                    else:
-                        console.print(f"[red]RAW not available (HTTP {head.status_code}), falling back…[/]\n")
-                except requests.RequestException as e:
-                    console.print(f"[red]Error checking RAW file: {e}, falling back…[/]\n")
-
-        caps = fetch_captions(cid)
-        auds = fetch_audio_languages(cid)
-        audio_lang = LANG_AUD.get(auds[0].lower(), auds[0].lower()) if auds else None
-        download_and_mux(manifest, args.output_dir, {"type": "movie", "title": safe, "year": year, "tag": args.tag, "lang_aud": audio_lang or "unk"}, caps, auds, args.max_connections, args.mp4_connections, args.resolution)
+        caps, auds = fetch_video_meta(cid)
+        context = {"type": "movie", "title": safe, "year": year, "tag": args.tag}
+        if args.raw and try_raw(manifest, args.output_dir, safe, context, caps, auds, args.max_connections, args.mp4_connections):
+            return
+        download_and_mux(manifest, args.output_dir, context, caps, auds, args.max_connections, args.mp4_connections, args.resolution)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    try:
+        main()
+    finally:
+        close_loop()
\ No newline at end of file